@@ -1,5 +1,7 @@
 #!/usr/bin/env python3
 
+import sys
+import argparse
 import threading
 import multiprocessing
 import subprocess
@@ -9,6 +11,9 @@ import time
 import shutil
 import os
 import hashlib
+import fcntl
+import re
+from contextlib import contextmanager
 from urllib.parse import urlparse, parse_qs
 from concurrent.futures import ThreadPoolExecutor
 import gi
@@ -21,11 +26,18 @@ log_f = os.path.join(app_fldr, 'yuzu-ea-revision.log')
 bkup_log_f = os.path.join(app_fldr, 'yuzu-ea-backup-revision.log')
 appimg_pth = os.path.join(app_fldr, 'yuzu-ea.AppImage')
 bkup_pth = os.path.join(app_fldr, 'yuzu-ea-backup.AppImage')
-temp_log_f = '/dev/shm/yuzu-ea-temp-revision.log'
-temp_pth = '/dev/shm/yuzu-ea-temp.AppImage'
+temp_log_f = f'/dev/shm/yuzu-ea-temp-revision-{os.getpid()}.log'
+temp_pth = f'/dev/shm/yuzu-ea-temp-{os.getpid()}.AppImage'
+extr_link = os.path.join(app_fldr, 'yuzu-ea')
+bkup_extr_link = os.path.join(app_fldr, 'yuzu-ea-backup')
 cfg_dir = os.path.join(os.environ['HOME'], '.config')
+desktop_dir = os.path.join(os.environ.get('XDG_DATA_HOME') or os.path.join(os.environ['HOME'], '.local', 'share'), 'applications')
+launcher_f = os.path.join(desktop_dir, 'yuzu-ea.desktop')
 cache_dir = os.path.join(os.environ['HOME'], '.cache', 'YEAST')
+lock_dir = os.path.join(cache_dir, 'locks')
 cfg_f = os.path.join(cfg_dir, 'YEAST.conf')
+extract_cfg_f = os.path.join(cfg_dir, 'YEAST-extract.conf')
+launcher_marker = 'X-YEAST-Managed=true'
 cache_exp = 50 * 24 * 60 * 60  # 50 days in seconds
 cached_pg_cnt = 0
 max_precached = 23
@@ -33,6 +45,10 @@ mem_cache = {}
 mem_cache_lock = threading.Lock()
 pre_caching_done = False
 graphql_url = "https://api.github.com/graphql"
+gql_timeout = 30  # Seconds; a page fetch holds a lock other instances may be waiting on
+dl_buf_size = 256 * 1024  # Reusable download buffer size in bytes
+batch_jobs = 4  # Concurrent downloads in batch mode
+batch_timeout = (10, 60)  # Connect and per-read timeouts in seconds for batch downloads
 
 def ensure_dir_exists(dir_pth):
     if not os.path.exists(dir_pth):
@@ -40,8 +56,90 @@ def ensure_dir_exists(dir_pth):
 
 ensure_dir_exists(app_fldr)
 ensure_dir_exists(cache_dir)
+ensure_dir_exists(lock_dir)
 ensure_dir_exists(cfg_dir)
 
+def read_extract_opt():
+    # YEAST_EXTRACT_APPIMAGE=1/0 turns pre-extracted installs on/off and is remembered, so runs
+    # from the YEAST desktop entry or Game Mode, which don't set it, keep the links in sync
+    env_opt = os.environ.get('YEAST_EXTRACT_APPIMAGE')
+    if env_opt == '1':
+        open(extract_cfg_f, 'w').close()
+    elif env_opt == '0' and os.path.exists(extract_cfg_f):
+        os.remove(extract_cfg_f)
+    return os.path.isfile(extract_cfg_f)
+
+extract_appimg = read_extract_opt()
+
+def wait_for_lock_with_dlg(f):
+    # Poll instead of blocking so the GTK main loop keeps running and the wait is visible
+    dlg = Gtk.MessageDialog(
+        transient_for=None,
+        flags=0,
+        message_type=Gtk.MessageType.INFO,
+        buttons=Gtk.ButtonsType.NONE,
+        text="Waiting for another install or extraction of Yuzu EA to finish..."
+    )
+    dlg.set_title("Waiting")
+    dlg.set_default_size(1280, 80)
+    dlg.show_all()
+    while True:
+        while Gtk.events_pending():
+            Gtk.main_iteration()
+        try:
+            fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            break
+        except BlockingIOError:
+            time.sleep(0.1)
+    dlg.destroy()
+
+@contextmanager
+def file_lock(name, wait_dlg=False):
+    # flock is held per open file, so this serialises other YEAST processes and other threads alike.
+    # Pass wait_dlg=True from the GTK main thread; never show a modal dialog while holding the lock.
+    with open(os.path.join(lock_dir, f"{name}.lock"), 'a') as f:
+        try:
+            fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            if wait_dlg:
+                wait_for_lock_with_dlg(f)
+            else:
+                print(f"Waiting for lock {name}...")
+                fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+def pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass  # Exists but belongs to someone else
+    return True
+
+def clean_up_stale_temps():
+    # Per-process temp copies outlive a killed run, and the /dev/shm ones hold RAM until reboot
+    # ~/Applications is shared with other apps, so only match names YEAST itself creates
+    for dir_pth, pattern in (('/dev/shm', r'yuzu-ea-temp-(?:revision-)?(\d+)\.(?:AppImage|log)'),
+                             (app_fldr, r'yuzu-ea(?:-\d+)?\.AppImage\.(\d+)\.part'),
+                             (app_fldr, r'yuzu-ea-\d+\.(\d+)\.extracting')):
+        if not os.path.isdir(dir_pth):
+            continue
+        for fn in os.listdir(dir_pth):
+            m = re.fullmatch(pattern, fn)
+            if m and not pid_alive(int(m.group(1))):
+                fpath = os.path.join(dir_pth, fn)
+                if os.path.isdir(fpath):
+                    shutil.rmtree(fpath, ignore_errors=True)
+                    continue
+                try:
+                    os.remove(fpath)
+                except OSError:
+                    pass
+
 def on_tv_row_act(tv, pth, col):
     model = tv.get_model()
     it = model.get_iter(pth)
@@ -84,8 +182,10 @@ def save_to_cache(cache_k, data):
     if not os.path.exists(cache_dir):
         os.makedirs(cache_dir)
     cache_f = os.path.join(cache_dir, f"{cache_k}.json")
-    with open(cache_f, 'w') as f:
+    tmp_f = f"{cache_f}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_f, 'w') as f:
         json.dump({'timestamp': time.time(), 'data': data}, f)
+    os.replace(tmp_f, cache_f)  # Readers only ever see a complete entry
 
 def get_from_cache(cache_k):
     cached_data = get_from_mem_cache(cache_k)
@@ -93,8 +193,11 @@ def get_from_cache(cache_k):
         return cached_data
     cache_f = os.path.join(cache_dir, f"{cache_k}.json")
     if os.path.exists(cache_f):
-        with open(cache_f, 'r') as f:
-            cache_cont = json.load(f)
+        try:
+            with open(cache_f, 'r') as f:
+                cache_cont = json.load(f)
+        except (OSError, ValueError):
+            return None  # Unreadable entry, e.g. left half-written by an older YEAST
         if time.time() - cache_cont['timestamp'] < cache_exp:
             save_to_mem_cache(cache_k, cache_cont['data'])
             return cache_cont['data']
@@ -211,8 +314,6 @@ def read_gh_token():
 
     return token
 
-gh_token = read_gh_token()
-
 def start_loader():
     dlg = Gtk.MessageDialog(
         transient_for=None,
@@ -319,12 +420,21 @@ def build_gql_qry(e_cursor, search_rev_num):
     return qry, vars
 
 def fetch_and_proc_data(gql_url, qry, vars, cache_k, search_rev_num):
-    hdrs = {"Authorization": f"Bearer {gh_token}"}
-    resp = requests.post(gql_url, json={'query': qry, 'variables': vars}, headers=hdrs)
-    if resp.status_code == 200:
-        data = resp.json()
-        save_to_cache(cache_k, data)
-        return proc_fetched_data(data, search_rev_num)
+    with file_lock(cache_k):
+        # Another process may have fetched this page while we waited for the lock
+        cached_data = get_from_cache(cache_k)
+        if cached_data:
+            return proc_fetched_data(cached_data, search_rev_num)
+        hdrs = {"Authorization": f"Bearer {gh_token}"}
+        try:
+            resp = requests.post(gql_url, json={'query': qry, 'variables': vars}, headers=hdrs, timeout=gql_timeout)
+        except requests.exceptions.RequestException as e:
+            print(f"Failed to fetch revisions from GitHub: {e}")
+            return "not_found", None
+        if resp.status_code == 200:
+            data = resp.json()
+            save_to_cache(cache_k, data)
+            return proc_fetched_data(data, search_rev_num)
     return "not_found", None
 
 def proc_cached_data(cached_data, search_rev_num):
@@ -390,41 +500,196 @@ def create_prog_dlg(title="Downloading", text="Starting download..."):
     dlg.show_all()
     return dlg, prog_bar
 
+def prealloc_f(fd, size):
+    # Reserve the whole file up front so it lands in as few extents as possible
+    if size <= 0 or not hasattr(os, 'posix_fallocate'):
+        return
+    try:
+        os.posix_fallocate(fd, 0, size)
+    except OSError:
+        pass  # Filesystem doesn't support it; fall back to growing the file as we write
+
+def pwrite_all(fd, data, offset):
+    while data:
+        written = os.pwrite(fd, data, offset)
+        data = data[written:]
+        offset += written
+
+def stream_to_file(resp, out_pth, on_chunk=None):
+    total_size = int(resp.headers.get('content-length', 0))
+    dl_size = 0
+    buf = bytearray(dl_buf_size)
+    buf_view = memoryview(buf)
+    resp.raw.decode_content = True
+    part_pth = f"{out_pth}.{os.getpid()}.part"
+    fd = os.open(part_pth, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o755)
+    try:
+        prealloc_f(fd, total_size)
+        while True:
+            n = resp.raw.readinto(buf)
+            if not n:
+                break
+            pwrite_all(fd, buf_view[:n], dl_size)
+            dl_size += n
+            if on_chunk:
+                on_chunk(dl_size, total_size)
+        # content-length counts encoded bytes, so only compare it when the body wasn't re-encoded
+        if total_size and not resp.headers.get('Content-Encoding') and dl_size != total_size:
+            raise OSError(f"Download incomplete: received {dl_size} of {total_size} bytes.")
+        os.ftruncate(fd, dl_size)  # Drop any preallocated tail left by a decoded body
+        os.fsync(fd)
+    except BaseException:
+        os.remove(part_pth)
+        raise
+    finally:
+        buf_view.release()
+        os.close(fd)
+    os.chmod(part_pth, 0o755)
+    os.replace(part_pth, out_pth)  # Only a complete download ever replaces the AppImage
+    return dl_size
+
 def dl_with_prog(url, out_pth, rev):
+    # Returns (retry, msg): retry when the user should pick again, msg to show once the
+    # install lock is released
     resp = requests.get(url, stream=True)
     if resp.status_code != 200:
         silent_ping("github.com")
         if resp.status_code == 404:
-            disp_msg("Failed to download the AppImage. The revision might not be found.")
-        else:
-            disp_msg("Failed to download the AppImage. Check your internet connection or try again later.")
-        main()
-        return
-    total_size = int(resp.headers.get('content-length', 0))
-    chunk_size = 1024
-    dl_size = 0
+            return True, "Failed to download the AppImage. The revision might not be found."
+        return True, "Failed to download the AppImage. Check your internet connection or try again later."
     dlg, prog_bar = create_prog_dlg()
-    with open(out_pth, 'wb') as f:
-        try:
-            for data in resp.iter_content(chunk_size=chunk_size):
-                f.write(data)
-                dl_size += len(data)
-                progress = dl_size / total_size
-                GLib.idle_add(prog_bar.set_fraction, progress)
-                GLib.idle_add(prog_bar.set_text, f"{int(progress * 100)}%")
-                while Gtk.events_pending():
-                    Gtk.main_iteration()
-                if not dlg.get_visible():
-                    raise Exception("Download cancelled by user.")
-        except Exception as e:
-            dlg.destroy()
-            disp_msg(str(e))
-            return
+
+    def on_chunk(dl_size, total_size):
+        progress = dl_size / total_size if total_size else 0
+        GLib.idle_add(prog_bar.set_fraction, progress)
+        GLib.idle_add(prog_bar.set_text, f"{int(progress * 100)}%")
+        while Gtk.events_pending():
+            Gtk.main_iteration()
+        if not dlg.get_visible():
+            raise Exception("Download cancelled by user.")
+
+    try:
+        stream_to_file(resp, out_pth, on_chunk)
+    except Exception as e:
+        dlg.destroy()
+        return False, str(e)
     dlg.destroy()
-    os.chmod(out_pth, 0o755)
     with open(log_f, 'w') as f:
         f.write(str(rev))
-    disp_msg(f"Download complete. Yuzu EA-{rev} has been installed.")
+    return False, f"Download complete. Yuzu EA-{rev} has been installed."
+
+def extr_dir_for(rev):
+    return os.path.join(app_fldr, f'yuzu-ea-{rev}')
+
+def read_symlink(link_pth):
+    try:
+        return os.readlink(link_pth)
+    except OSError:
+        return None
+
+def swap_symlink(link_pth, target):
+    # Build the new link beside the old one and rename it over, so the link is never missing
+    tmp_link = f"{link_pth}.{os.getpid()}.tmp"
+    if os.path.lexists(tmp_link):
+        os.remove(tmp_link)
+    os.symlink(target, tmp_link)
+    os.replace(tmp_link, link_pth)
+
+def extract_appimg_to(appimg, rev):
+    dest = extr_dir_for(rev)
+    if os.path.isdir(dest):
+        return dest  # Already extracted, e.g. when reinstalling the backup revision
+    staging = f"{dest}.{os.getpid()}.extracting"
+    shutil.rmtree(staging, ignore_errors=True)
+    os.makedirs(staging)
+    try:
+        subprocess.run([appimg, '--appimage-extract'], cwd=staging, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+        if not os.path.isdir(dest):
+            os.rename(os.path.join(staging, 'squashfs-root'), dest)
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+    return dest
+
+def prune_extracted():
+    keep = {read_symlink(extr_link), read_symlink(bkup_extr_link)}
+    for fn in os.listdir(app_fldr):
+        if fn.startswith('yuzu-ea-') and fn[len('yuzu-ea-'):].isdigit() and fn not in keep:
+            shutil.rmtree(os.path.join(app_fldr, fn), ignore_errors=True)
+
+def remove_symlink(link_pth):
+    if os.path.islink(link_pth):
+        os.remove(link_pth)
+
+def launcher_is_ours():
+    # Never touch a yuzu-ea.desktop that the user or another tool wrote
+    try:
+        with open(launcher_f, 'r') as f:
+            return launcher_marker in f.read().splitlines()
+    except FileNotFoundError:
+        return True
+
+def write_launcher_entry(exec_pth):
+    if not launcher_is_ours():
+        print(f"Not overwriting {launcher_f}, it wasn't written by YEAST.")
+        return
+    ensure_dir_exists(desktop_dir)
+    with open(launcher_f, 'w') as f:
+        f.write("[Desktop Entry]\n"
+                "Name=yuzu EA\n"
+                f"Exec={exec_pth}\n"
+                "Type=Application\n"
+                "Categories=Game;\n"
+                f"{launcher_marker}\n")
+
+def sync_extracted():
+    # Point each link at the extracted copy of the revision its log records, extracting it if
+    # needed, so the links also catch up with AppImages installed while extraction was off
+    with file_lock('install'):
+        try:
+            for appimg, rev_log, link_pth in ((appimg_pth, log_f, extr_link), (bkup_pth, bkup_log_f, bkup_extr_link)):
+                rev = read_revision_number(rev_log)
+                if not rev.isdigit() or not os.path.isfile(appimg):
+                    remove_symlink(link_pth)
+                    continue
+                try:
+                    extract_appimg_to(appimg, rev)
+                    swap_symlink(link_pth, os.path.basename(extr_dir_for(rev)))
+                except (OSError, subprocess.CalledProcessError) as e:
+                    print(f"Failed to extract Yuzu EA-{rev}: {e}")
+                    remove_symlink(link_pth)  # A link to another revision is worse than none
+            prune_extracted()
+            # Fall back to the AppImage so the launcher always starts the installed revision
+            in_sync = read_symlink(extr_link) == os.path.basename(extr_dir_for(read_revision_number(log_f)))
+            write_launcher_entry(os.path.join(extr_link, 'AppRun') if in_sync else appimg_pth)
+        except OSError as e:
+            print(f"Failed to update the extracted Yuzu EA installs: {e}")
+
+def disable_extracted():
+    # Extraction was switched off, so drop the links before they fall behind the AppImages
+    with file_lock('install'):
+        try:
+            remove_symlink(extr_link)
+            remove_symlink(bkup_extr_link)
+            prune_extracted()
+            if os.path.exists(launcher_f) and launcher_is_ours():
+                os.remove(launcher_f)
+        except OSError as e:
+            print(f"Failed to remove the extracted Yuzu EA installs: {e}")
+
+def revert_extracted():
+    cur_target = read_symlink(extr_link)
+    bkup_target = read_symlink(bkup_extr_link)
+    if cur_target and bkup_target:
+        swap_symlink(extr_link, bkup_target)
+        swap_symlink(bkup_extr_link, cur_target)
+    start_extract_worker()  # Extracts whichever side wasn't extracted yet
+
+def start_extract_worker():
+    # Non-daemon so the extraction finishes even after the dialogs have closed. It waits for
+    # the install lock, so it never reads an AppImage another instance is replacing.
+    worker = threading.Thread(target=sync_extracted)
+    worker.start()
+    return worker
 
 def gk_event_hdlr(widget, event, tv, lststore, dlg):
     if tv is not None and lststore is not None:
@@ -536,17 +801,27 @@ def prompt_revert_to_backup():
     dialog.destroy()
     return response == Gtk.ResponseType.YES
 
-def revert_to_backup():
-    if os.path.exists(appimg_pth) and os.path.exists(bkup_pth):
-        shutil.move(appimg_pth, temp_pth)  # Move current AppImage to a temporary location
-        shutil.move(bkup_pth, appimg_pth)  # Move backup AppImage to the current location
-        shutil.move(temp_pth, bkup_pth)  # Move the temporary AppImage to the backup location
+def revert_to_backup_locked():
+    if not (os.path.exists(appimg_pth) and os.path.exists(bkup_pth)):
+        return False
+    shutil.move(appimg_pth, temp_pth)  # Move current AppImage to a temporary location
+    shutil.move(bkup_pth, appimg_pth)  # Move backup AppImage to the current location
+    shutil.move(temp_pth, bkup_pth)  # Move the temporary AppImage to the backup location
+
+    if os.path.exists(log_f) and os.path.exists(bkup_log_f):
+        shutil.move(log_f, temp_log_f)  # Move current log to a temporary location
+        shutil.move(bkup_log_f, log_f)  # Move backup log to the current log's location
+        shutil.move(temp_log_f, bkup_log_f)  # Move the temporary log to the backup log's location
 
-        if os.path.exists(log_f) and os.path.exists(bkup_log_f):
-            shutil.move(log_f, temp_log_f)  # Move current log to a temporary location
-            shutil.move(bkup_log_f, log_f)  # Move backup log to the current log's location
-            shutil.move(temp_log_f, bkup_log_f)  # Move the temporary log to the backup log's location
+    if extract_appimg:
+        revert_extracted()  # Swap the extracted directory links to match
+    return True
 
+def revert_to_backup():
+    # Another instance may be installing, so swap the files under the install lock
+    with file_lock('install', wait_dlg=True):
+        reverted = revert_to_backup_locked()
+    if reverted:
         # Show a success dialog with specified size
         dialog = Gtk.MessageDialog(
             transient_for=None,
@@ -571,10 +846,164 @@ def revert_to_backup():
         dialog.run()
         dialog.destroy()
 
+def appimg_url_for(rev):
+    return f"https://github.com/pineappleEA/pineapple-src/releases/download/EA-{rev}/Linux-Yuzu-EA-{rev}.AppImage"
+
+def batch_pth_for(rev):
+    return os.path.join(app_fldr, f'yuzu-ea-{rev}.AppImage')
+
+def parse_rev_spec(specs):
+    # Accepts "4100", "4100-4110" and comma-separated mixes of both
+    revs = set()
+    for spec in specs:
+        for part in spec.split(','):
+            part = part.strip()
+            if not part:
+                continue
+            if '-' in part:
+                lo, hi = (int(x) for x in part.split('-', 1))
+                revs.update(range(min(lo, hi), max(lo, hi) + 1))
+            else:
+                revs.add(int(part))
+    return sorted(revs)
+
+def list_tag_revs(min_rev):
+    # Walk the tag pages newest-first, stopping once we're past the oldest requested revision.
+    # Returns the revisions seen and whether the walk got that far without a failed fetch.
+    tag_revs = set()
+    e_cursor = None
+    while True:
+        qry, vars = build_gql_qry(e_cursor, None)
+        cache_k = gen_cache_key(qry, vars)
+        data = get_from_cache(cache_k)
+        if not data:
+            fetch_and_proc_data(graphql_url, qry, vars, cache_k, None)
+            data = get_from_cache(cache_k)
+        if not data or 'data' not in data or not data['data'] or 'repository' not in data['data']:
+            print("Failed to fetch the tag list from GitHub. Check your internet connection, GitHub token or API rate limit.")
+            return tag_revs, False
+        refs = data['data']['repository']['refs']
+        pg_revs = []
+        for edge in refs['edges']:
+            tag_name = edge['node']['name']
+            if 'EA-' in tag_name:
+                try:
+                    pg_revs.append(int(tag_name.split('EA-')[-1]))
+                except ValueError:
+                    continue
+        tag_revs.update(pg_revs)
+        if not refs['pageInfo']['hasNextPage'] or (pg_revs and min(pg_revs) < min_rev):
+            break
+        e_cursor = refs['pageInfo']['endCursor']
+    return tag_revs, True
+
+def batch_dl(rev):
+    out_pth = batch_pth_for(rev)
+    url = appimg_url_for(rev)
+    start = time.monotonic()
+    with file_lock(f"dl-{url_to_fn(url)}"):
+        if os.path.isfile(out_pth):
+            return rev, "present", os.path.getsize(out_pth), time.monotonic() - start
+        try:
+            resp = requests.get(url, stream=True, timeout=batch_timeout)
+            if resp.status_code != 200:
+                return rev, f"HTTP {resp.status_code}", 0, time.monotonic() - start
+            size = stream_to_file(resp, out_pth)
+        except Exception as e:
+            # readinto on the raw stream raises urllib3 errors that requests doesn't wrap
+            return rev, f"failed: {e}", 0, time.monotonic() - start
+    return rev, "downloaded", size, time.monotonic() - start
+
+def batch_install(revs, jobs=batch_jobs):
+    start = time.monotonic()
+    tag_revs, tags_complete = list_tag_revs(min(revs))
+    found = [rev for rev in revs if rev in tag_revs]
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as exec:
+        results = {res[0]: res for res in exec.map(batch_dl, found)}
+    for rev in revs:
+        if rev in results:
+            _, status, size, secs = results[rev]
+            if status in ("downloaded", "present"):
+                print(f"EA-{rev}: {status}, {size / (1024 * 1024):.1f} MiB in {secs:.1f}s -> {batch_pth_for(rev)}")
+            else:
+                print(f"EA-{rev}: {status} after {secs:.1f}s")
+        elif tags_complete or (tag_revs and rev >= min(tag_revs)):
+            print(f"EA-{rev}: not found")
+        else:
+            # The pages that would list it weren't fetched, so it may still exist
+            print(f"EA-{rev}: unresolved, tag list incomplete")
+    landed = sum(1 for _, status, _, _ in results.values() if status in ("downloaded", "present"))
+    print(f"{landed}/{len(revs)} revisions landed in {time.monotonic() - start:.1f}s")
+    return tags_complete and landed == len(revs)
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="yuzu early access software tracker")
+    parser.add_argument('--batch', nargs='+', metavar='REVS',
+                        help="download revisions side by side for bisecting, e.g. 4100-4110 4120,4125")
+    parser.add_argument('--jobs', type=int, default=batch_jobs,
+                        help=f"concurrent downloads in batch mode (default {batch_jobs})")
+    return parser.parse_args()
+
+def install_from_batch(rev):
+    # Reuse a --batch download rather than fetching the same AppImage again
+    part_pth = f"{appimg_pth}.{os.getpid()}.part"
+    shutil.copy(batch_pth_for(rev), part_pth)
+    os.replace(part_pth, appimg_pth)
+    with open(log_f, 'w') as f:
+        f.write(str(rev))
+    return f"Revision {rev} has been installed from its batch download."
+
+def install_rev(rev):
+    # Runs under the install lock, so it returns (retry, msg) instead of showing dialogs:
+    # retry when the user should pick again, msg to show once the lock is released
+    if read_revision_number(log_f) == rev and os.path.isfile(appimg_pth):
+        return False, f"Revision EA-{rev} is already installed."  # Another instance got here first
+    try:
+        if os.path.isfile(appimg_pth):
+            shutil.copy(appimg_pth, temp_pth)
+            if os.path.isfile(log_f):
+                shutil.copy(log_f, temp_log_f)
+        skip_dl = False
+        if os.path.isfile(bkup_log_f):
+            with open(bkup_log_f, 'r') as f:
+                bkup_rev = f.read().strip()
+            if rev == bkup_rev:
+                if os.path.isfile(bkup_pth):
+                    shutil.move(bkup_pth, appimg_pth)
+                shutil.move(bkup_log_f, log_f)
+                skip_dl = True
+        if skip_dl:
+            msg = f"Revision {rev} has been installed from backup."
+        else:
+            appimg_url = appimg_url_for(rev)
+            # Same lock as batch_dl, so a batch run still fetching this revision is waited on
+            with file_lock(f"dl-{url_to_fn(appimg_url)}", wait_dlg=True):
+                if os.path.isfile(batch_pth_for(rev)):
+                    msg = install_from_batch(rev)
+                else:
+                    retry, msg = dl_with_prog(appimg_url, appimg_pth, rev)
+                    if retry:
+                        return True, msg
+        # Only rotate the previous install into the backup slot once the new one is in place
+        if read_revision_number(log_f) == rev and os.path.isfile(temp_pth):
+            shutil.move(temp_pth, bkup_pth)
+            if os.path.isfile(temp_log_f):
+                shutil.move(temp_log_f, bkup_log_f)
+        if extract_appimg and read_revision_number(log_f) == rev:
+            start_extract_worker()
+        return False, msg
+    finally:
+        for pth in (temp_pth, temp_log_f):
+            if os.path.isfile(pth):
+                os.remove(pth)
+
 # Main loop
 def main():
     global current_url, gh_token, prev_url, next_url
 
+    clean_up_stale_temps()
+    if not extract_appimg and (os.path.islink(extr_link) or os.path.islink(bkup_extr_link)):
+        disable_extracted()
     if not ping_github():
         user_choice = prompt_revert_to_backup()
         if user_choice:
@@ -707,31 +1136,14 @@ def main():
             else:
                 dlg.destroy()
                 continue
-    if os.path.isfile(appimg_pth):
-        shutil.copy(appimg_pth, temp_pth)
-        if os.path.isfile(log_f):
-            shutil.copy(log_f, temp_log_f)
-    skip_dl = False
-    if os.path.isfile(bkup_log_f):
-        with open(bkup_log_f, 'r') as f:
-            bkup_rev = f.read().strip()
-        if rev == bkup_rev:
-            if os.path.isfile(bkup_pth):
-                shutil.move(bkup_pth, appimg_pth)
-            shutil.move(bkup_log_f, log_f)
-            skip_dl = True
-    else:
-        skip_dl = False
-    if skip_dl:
-        disp_msg(f"Revision {rev} has been installed from backup.")
-    else:
-        if not skip_dl:
-            appimg_url = f"https://github.com/pineappleEA/pineapple-src/releases/download/EA-{rev}/Linux-Yuzu-EA-{rev}.AppImage"
-            dl_with_prog(appimg_url, appimg_pth, rev)
-    if os.path.isfile(temp_pth):
-        shutil.move(temp_pth, bkup_pth)
-        if os.path.isfile(temp_log_f):
-            shutil.move(temp_log_f, bkup_log_f)
+    # The installed AppImage, the backup and their logs are shared by every YEAST instance
+    with file_lock('install', wait_dlg=True):
+        retry, msg = install_rev(rev)
+    if msg:
+        disp_msg(msg)
+    if retry:
+        main()  # Outside the lock so picking a revision again can't deadlock
+        return
     if os.path.isfile(log_f):
         with open(log_f, 'r') as f:
             installed_tag = f.read().strip()
@@ -740,4 +1152,20 @@ def main():
             bkup_tag = f.read().strip()
 
 if __name__ == "__main__":
+    # Parse arguments before validating the token, so usage errors don't wait on GitHub or a dialog
+    args = parse_args()
+    batch_revs = None
+    if args.batch:
+        try:
+            batch_revs = parse_rev_spec(args.batch)
+        except ValueError:
+            print("Revisions must be numbers or ranges like 4100-4110.")
+            sys.exit(2)
+        if not batch_revs:
+            print("No revisions given. Pass numbers or ranges like 4100-4110.")
+            sys.exit(2)
+    gh_token = read_gh_token()
+    if batch_revs:
+        clean_up_stale_temps()
+        sys.exit(0 if batch_install(batch_revs, args.jobs) else 1)
     main()